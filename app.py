@@ -1,14 +1,14 @@
 import streamlit as st
-import plotly.express as px
-import pandas as pd
+import plotly.graph_objects as go
+from plotly_resampler import FigureResampler
 from src.database.manager import DatabaseManager
 from src.llm.agent import SQLAgent
-from src.config.settings import settings
+from src.config.settings import get_settings
 import os
 
 st.set_page_config(page_title="E-commerce RAG Analytics", layout="wide")
 st.title("E-commerce Growth Analytics (Agentic RAG)")
-os.environ["OPENAI_API_KEY"] = settings.OPENAI_API_KEY
+os.environ["OPENAI_API_KEY"] = get_settings().OPENAI_API_KEY
 
 # Initialize DB and Agent (cache for performance)
 @st.cache_resource
@@ -19,6 +19,73 @@ def get_agent():
 
 agent = get_agent()
 
+# Cache chart queries and insights so repeated clicks skip the DB/LLM round-trip
+@st.cache_data(ttl=600, show_spinner=False)
+def top_states(_db_manager):
+    query = """
+    SELECT customer_state, COUNT(*) as customer_count
+    FROM customers
+    GROUP BY customer_state
+    ORDER BY customer_count DESC
+    LIMIT 10;
+    """
+    return _db_manager.read_frame(query)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def top_categories(_db_manager):
+    query = """
+    SELECT t.product_category_name_english as category, COUNT(p.product_id) as product_count
+    FROM products p
+    JOIN category_translations t ON p.product_category_name = t.product_category_name
+    GROUP BY t.product_category_name_english
+    ORDER BY product_count DESC
+    LIMIT 10;
+    """
+    return _db_manager.read_frame(query)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def monthly_trend(_db_manager):
+    query = """
+    SELECT DATE_TRUNC('month', order_purchase_timestamp) as month, COUNT(*) as order_count
+    FROM orders
+    WHERE order_purchase_timestamp IS NOT NULL
+    GROUP BY month
+    ORDER BY month;
+    """
+    return _db_manager.read_frame(query)
+
+def columns(df, *names):
+    """Hand columns to Plotly as numpy arrays so it serializes buffers rather than Python lists"""
+    return tuple(df[name].to_numpy() for name in names)
+
+# Figures are memoized as plain dicts, which st.plotly_chart renders without re-validating
+@st.cache_data(show_spinner=False)
+def build_state_fig(df):
+    states, counts = columns(df, 'customer_state', 'customer_count')
+    fig = go.Figure(go.Bar(x=states, y=counts))
+    fig.update_layout(title='Top 10 States by Customer Count', xaxis_title='State', yaxis_title='Customers')
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False)
+def build_category_fig(df):
+    categories, counts = columns(df, 'category', 'product_count')
+    fig = go.Figure(go.Bar(x=counts, y=categories, orientation='h'))
+    fig.update_layout(title='Top 10 Product Categories', xaxis_title='Products', yaxis_title='Category')
+    return fig.to_dict()
+
+@st.cache_data(show_spinner=False)
+def build_trend_fig(df):
+    # LTTB-downsample so only ~1000 points reach the browser however fine the series gets
+    months, counts = columns(df, 'month', 'order_count')
+    fig = FigureResampler(go.Figure())
+    fig.add_trace(go.Scattergl(mode='lines+markers', name='Orders'), hf_x=months, hf_y=counts)
+    fig.update_layout(title='Monthly Order Volume', xaxis_title='Month', yaxis_title='Orders')
+    return fig.to_dict()
+
+@st.cache_data(ttl=600, show_spinner=False)
+def generate_insight(query_result, question):
+    return get_agent().generate_insight(query_result, question)
+
 st.sidebar.header("Ask a Question")
 user_question = st.sidebar.text_area("Enter your business question (English or Persian):", height=80)
 
@@ -26,7 +93,7 @@ if st.sidebar.button("Submit") and user_question.strip():
     with st.spinner("Processing..."):
         result = agent.run(user_question)
         # Generate business insight
-        insight = agent.generate_insight(result.get('query_result', ''), user_question)
+        insight = generate_insight(result.get('query_result', ''), user_question)
         if result.get("error"):
             st.error(f"Error: {result['error']}")
         else:
@@ -38,43 +105,15 @@ st.sidebar.header("Show Analytics Charts")
 
 # Example: Show Top 10 States by Customer Count
 if st.sidebar.button("Top 10 States by Customers"):
-    db_manager = agent.db_manager
-    query = """
-    SELECT customer_state, COUNT(*) as customer_count
-    FROM customers
-    GROUP BY customer_state
-    ORDER BY customer_count DESC
-    LIMIT 10;
-    """
-    df = pd.read_sql(query, db_manager.engine)
-    fig = px.bar(df, x='customer_state', y='customer_count', title='Top 10 States by Customer Count')
+    fig = build_state_fig(top_states(agent.db_manager))
     st.plotly_chart(fig, use_container_width=True)
 
 # Example: Show Top 10 Product Categories
 if st.sidebar.button("Top 10 Product Categories"):
-    db_manager = agent.db_manager
-    query = """
-    SELECT t.product_category_name_english as category, COUNT(p.product_id) as product_count
-    FROM products p
-    JOIN category_translations t ON p.product_category_name = t.product_category_name
-    GROUP BY t.product_category_name_english
-    ORDER BY product_count DESC
-    LIMIT 10;
-    """
-    df = pd.read_sql(query, db_manager.engine)
-    fig = px.bar(df, y='category', x='product_count', orientation='h', title='Top 10 Product Categories')
+    fig = build_category_fig(top_categories(agent.db_manager))
     st.plotly_chart(fig, use_container_width=True)
 
 # Example: Show Monthly Order Trend
 if st.sidebar.button("Monthly Order Trend"):
-    db_manager = agent.db_manager
-    query = """
-    SELECT DATE_TRUNC('month', order_purchase_timestamp) as month, COUNT(order_id) as order_count
-    FROM orders
-    WHERE order_purchase_timestamp IS NOT NULL
-    GROUP BY month
-    ORDER BY month;
-    """
-    df = pd.read_sql(query, db_manager.engine)
-    fig = px.line(df, x='month', y='order_count', markers=True, title='Monthly Order Volume')
+    fig = build_trend_fig(monthly_trend(agent.db_manager))
     st.plotly_chart(fig, use_container_width=True)
@@ -1,14 +1,14 @@
 from src.database.manager import DatabaseManager
 
 def check_status():
-    db = DatabaseManager()
+    db = DatabaseManager(use_pool=False)
     print("Testing connection...")
     if db.connect():
         print("Connection successful.")
         status = db.test_connection()
         print(f"Status: {status}")
         
-        info = db.get_table_info()
+        info = db.get_table_info(exact=False)
         print("Table Info:")
         for table, count in info.items():
             print(f" - {table}: {count} rows")
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from src.database.manager import DatabaseManager
 from src.etl.importer import CSVImporter
 
@@ -18,13 +19,20 @@ def run_migration(db_instance):
         (importer.import_products, "Products")
     ]
     
-    for func, name in steps_phase_1:
-        print(f"   Importing {name}...", end="\r")
-        if func():
-            print(f"   {name} Imported    ")
-        else:
-            print(f"   Failed to import {name}")
-            return False
+    # Phase 1 tables have no foreign keys between them, so import them concurrently
+    phase_1_ok = True
+    with ThreadPoolExecutor(max_workers=len(steps_phase_1)) as executor:
+        futures = {executor.submit(func): name for func, name in steps_phase_1}
+        for future in as_completed(futures):
+            name = futures[future]
+            if future.result():
+                print(f"   {name} Imported    ")
+            else:
+                print(f"   Failed to import {name}")
+                phase_1_ok = False
+    
+    if not phase_1_ok:
+        return False
 
     # 2. Import Dependent Tables (With Foreign Keys)
     print("\nPhase 2: Importing Dependent Tables...")
@@ -50,7 +58,8 @@ def run_migration(db_instance):
 
 if __name__ == "__main__":
     # Initialize and connect to database
-    db = DatabaseManager()
+    # Bulk loads can legitimately run longer than the default statement timeout
+    db = DatabaseManager(use_pool=False, statement_timeout_ms=0)
     
     print("Connecting to database...")
     if db.connect():
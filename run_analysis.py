@@ -5,7 +5,7 @@ from src.etl.rag_extractor import RAGDataExtractor
 
 def main():
     # Initialize Database Manager
-    db_manager = DatabaseManager()
+    db_manager = DatabaseManager(use_pool=False)
     
     if not db_manager.connect():
         print("Failed to connect to the database. Exiting.")
@@ -15,14 +15,18 @@ def main():
     print("Starting Exploratory Data Analysis...")
     analyzer = ECommerceAnalyzer(db_manager)
     
+    # Run all queries concurrently, then plot serially (matplotlib is not thread-safe);
+    # each frame is popped as it is plotted so it can be freed right after
+    frames = analyzer.fetch_all()
+    
     print("Analyzing Customer Demographics...")
-    analyzer.analyze_customer_demographics()
+    analyzer.analyze_customer_demographics(frames.pop('customer_demographics', None))
     
     print("Analyzing Product Categories...")
-    analyzer.analyze_product_categories()
+    analyzer.analyze_product_categories(frames.pop('product_categories', None))
     
     print("Analyzing Order Trends...")
-    analyzer.analyze_order_trends()
+    analyzer.analyze_order_trends(frames.pop('order_trends', None))
     
     print("EDA Completed. Check 'analysis_outputs' directory for plots.")
 
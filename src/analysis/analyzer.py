@@ -1,9 +1,48 @@
 import pandas as pd
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
 from src.database.manager import DatabaseManager
 
+# Plots are written as WebP at dashboard resolution (much smaller than default PNG)
+PLOT_FORMAT = "webp"
+PLOT_DPI = 90
+
+# Queries are built once at import rather than on every call
+DEMOGRAPHICS_QUERY = """
+SELECT customer_state, COUNT(*) as customer_count
+FROM customers
+GROUP BY customer_state
+ORDER BY customer_count DESC
+LIMIT 10;
+"""
+
+CATEGORIES_QUERY = """
+SELECT 
+    t.product_category_name_english as category,
+    COUNT(p.product_id) as product_count
+FROM products p
+JOIN category_translations t ON p.product_category_name = t.product_category_name
+GROUP BY t.product_category_name_english
+ORDER BY product_count DESC
+LIMIT 10;
+"""
+
+ORDER_TRENDS_QUERY = """
+SELECT 
+    DATE_TRUNC('month', order_purchase_timestamp) as month,
+    COUNT(*) as order_count
+FROM orders
+WHERE order_purchase_timestamp IS NOT NULL
+GROUP BY month
+ORDER BY month;
+"""
+
 class ECommerceAnalyzer:
     """
     Class for performing Exploratory Data Analysis (EDA) on the E-commerce dataset.
@@ -18,111 +57,140 @@ class ECommerceAnalyzer:
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
             
-        # Set plot style
+        # Set plot style (seaborn is only used for theming; plots use matplotlib directly)
         sns.set_theme(style="whitegrid")
         plt.rcParams['figure.figsize'] = (12, 6)
+        plt.rcParams['path.simplify'] = True
+        plt.rcParams['agg.path.chunksize'] = 10000
+        
+        # Reuse a single figure for every plot instead of creating one per call.
+        # Constrained layout recomputes margins on every save, so no plot
+        # inherits the previous one's layout
+        self.fig, self.ax = plt.subplots(layout="constrained")
 
-    def analyze_customer_demographics(self):
+    def fetch_all(self) -> Dict[str, pd.DataFrame]:
         """
-        Analyze and visualize customer distribution by state.
+        Fetch the data for every analysis concurrently.
+        connectorx releases the GIL while reading, so the wall-clock cost is
+        the slowest query rather than the sum of all three.
+        
+        Returns:
+            Dict: Analysis name and its DataFrame (failed fetches are omitted)
         """
-        query = """
-        SELECT customer_state, COUNT(*) as customer_count
-        FROM customers
-        GROUP BY customer_state
-        ORDER BY customer_count DESC
-        LIMIT 10;
+        queries = {
+            'customer_demographics': DEMOGRAPHICS_QUERY,
+            'product_categories': CATEGORIES_QUERY,
+            'order_trends': ORDER_TRENDS_QUERY
+        }
+        
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            futures = {
+                name: executor.submit(self.db_manager.read_frame, query)
+                for name, query in queries.items()
+            }
+        
+        frames = {}
+        for name, future in futures.items():
+            try:
+                frames[name] = future.result()
+            except Exception as e:
+                self.logger.error(f"Error fetching {name}: {e}")
+        return frames
+
+    def analyze_customer_demographics(self, df: Optional[pd.DataFrame] = None):
         """
+        Analyze and visualize customer distribution by state.
         
+        Args:
+            df: Pre-fetched data (see fetch_all); queried when omitted
+        """
         try:
-            df = pd.read_sql(query, self.db_manager.engine)
+            if df is None:
+                df = self.db_manager.read_frame(DEMOGRAPHICS_QUERY)
             self.logger.info(f"Fetched customer demographics: {len(df)} rows")
             
-            plt.figure(figsize=(12, 6))
-            sns.barplot(data=df, x='customer_state', y='customer_count', palette='viridis')
-            plt.title('Top 10 States by Customer Count')
-            plt.xlabel('State')
-            plt.ylabel('Number of Customers')
+            self.fig.set_size_inches(12, 6)
+            colors = plt.cm.viridis(np.linspace(0, 1, len(df)))
+            self.ax.bar(df['customer_state'].to_numpy(), df['customer_count'].to_numpy(), color=colors)
+            self.ax.set_title('Top 10 States by Customer Count')
+            self.ax.set_xlabel('State')
+            self.ax.set_ylabel('Number of Customers')
             
-            output_path = os.path.join(self.output_dir, 'customer_demographics.png')
-            plt.savefig(output_path)
-            plt.close()
+            output_path = os.path.join(self.output_dir, f'customer_demographics.{PLOT_FORMAT}')
+            self.fig.savefig(output_path, format=PLOT_FORMAT, dpi=PLOT_DPI)
             self.logger.info(f"Saved customer demographics plot to {output_path}")
             
             return df
         except Exception as e:
             self.logger.error(f"Error analyzing customer demographics: {e}")
             return pd.DataFrame()
+        finally:
+            # Clear the shared axes for the next plot and drop this plot's artists
+            self.ax.clear()
 
-    def analyze_product_categories(self):
+    def analyze_product_categories(self, df: Optional[pd.DataFrame] = None):
         """
         Analyze and visualize top product categories.
-        """
-        query = """
-        SELECT 
-            t.product_category_name_english as category,
-            COUNT(p.product_id) as product_count
-        FROM products p
-        JOIN category_translations t ON p.product_category_name = t.product_category_name
-        GROUP BY t.product_category_name_english
-        ORDER BY product_count DESC
-        LIMIT 10;
-        """
         
+        Args:
+            df: Pre-fetched data (see fetch_all); queried when omitted
+        """
         try:
-            df = pd.read_sql(query, self.db_manager.engine)
+            if df is None:
+                df = self.db_manager.read_frame(CATEGORIES_QUERY)
             self.logger.info(f"Fetched product categories: {len(df)} rows")
             
             # Visualization
-            plt.figure(figsize=(12, 8))
-            sns.barplot(data=df, y='category', x='product_count', palette='magma')
-            plt.title('Top 10 Product Categories')
-            plt.xlabel('Number of Products')
-            plt.ylabel('Category')
+            self.fig.set_size_inches(12, 8)
+            colors = plt.cm.magma(np.linspace(0, 1, len(df)))
+            self.ax.barh(df['category'].to_numpy(), df['product_count'].to_numpy(), color=colors)
+            self.ax.invert_yaxis()
+            self.ax.set_title('Top 10 Product Categories')
+            self.ax.set_xlabel('Number of Products')
+            self.ax.set_ylabel('Category')
             
-            output_path = os.path.join(self.output_dir, 'product_categories.png')
-            plt.savefig(output_path)
-            plt.close()
+            output_path = os.path.join(self.output_dir, f'product_categories.{PLOT_FORMAT}')
+            self.fig.savefig(output_path, format=PLOT_FORMAT, dpi=PLOT_DPI)
             self.logger.info(f"Saved product categories plot to {output_path}")
             
             return df
         except Exception as e:
             self.logger.error(f"Error analyzing product categories: {e}")
             return pd.DataFrame()
+        finally:
+            # Clear the shared axes for the next plot and drop this plot's artists
+            self.ax.clear()
 
-    def analyze_order_trends(self):
+    def analyze_order_trends(self, df: Optional[pd.DataFrame] = None):
         """
         Analyze and visualize monthly order trends.
-        """
-        query = """
-        SELECT 
-            DATE_TRUNC('month', order_purchase_timestamp) as month,
-            COUNT(order_id) as order_count
-        FROM orders
-        WHERE order_purchase_timestamp IS NOT NULL
-        GROUP BY month
-        ORDER BY month;
-        """
         
+        Args:
+            df: Pre-fetched data (see fetch_all); queried when omitted
+        """
         try:
-            df = pd.read_sql(query, self.db_manager.engine)
+            if df is None:
+                df = self.db_manager.read_frame(ORDER_TRENDS_QUERY)
             self.logger.info(f"Fetched order trends: {len(df)} rows")
             
             # Visualization
-            plt.figure(figsize=(14, 6))
-            sns.lineplot(data=df, x='month', y='order_count', marker='o', color='b')
-            plt.title('Monthly Order Volume')
-            plt.xlabel('Date')
-            plt.ylabel('Number of Orders')
-            plt.xticks(rotation=45)
-            plt.tight_layout()
+            self.fig.set_size_inches(14, 6)
+            self.ax.plot(df['month'].to_numpy(), df['order_count'].to_numpy(), marker='o', color='b')
+            self.ax.set_title('Monthly Order Volume')
+            self.ax.set_xlabel('Date')
+            self.ax.set_ylabel('Number of Orders')
+            # Rotate this plot's labels only; tick_params(labelrotation=...) would survive ax.clear()
+            for label in self.ax.get_xticklabels():
+                label.set_rotation(45)
             
-            output_path = os.path.join(self.output_dir, 'order_trends.png')
-            plt.savefig(output_path)
-            plt.close()
+            output_path = os.path.join(self.output_dir, f'order_trends.{PLOT_FORMAT}')
+            self.fig.savefig(output_path, format=PLOT_FORMAT, dpi=PLOT_DPI)
             self.logger.info(f"Saved order trends plot to {output_path}")
             
             return df
         except Exception as e:
             self.logger.error(f"Error analyzing order trends: {e}")
             return pd.DataFrame()
+        finally:
+            # Clear the shared axes for the next plot and drop this plot's artists
+            self.ax.clear()
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from pydantic import PostgresDsn, computed_field
 import os
@@ -10,6 +11,8 @@ class Settings(BaseSettings):
     DB_PORT: int
     DB_NAME: str
     OPENAI_API_KEY: str
+    # Server-side limit for a single statement (0 disables it)
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
 
     @computed_field
     @property
@@ -21,4 +24,9 @@ class Settings(BaseSettings):
         env_file = str(Path(__file__).resolve().parent.parent.parent / ".env")
         env_file_encoding = "utf-8"
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Load settings once per process; later calls (e.g. Streamlit reruns) reuse them
+    """
+    return Settings()
@@ -1,23 +1,79 @@
 import logging
 from contextlib import contextmanager
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from urllib.parse import quote, urlsplit, urlunsplit
+import connectorx as cx
+import pandas as pd
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
-from src.config.settings import settings
+from sqlalchemy.pool import NullPool
+from src.config.settings import get_settings
 from src.models.models import Base
 
+# Indexes backing the analytics aggregations (not expressible on the models)
+ANALYTICS_INDEXES = [
+    # Covers the monthly-trend aggregate (COUNT(*), so no heap column is needed) as an index-only scan
+    "CREATE INDEX IF NOT EXISTS idx_orders_purchase_ts ON orders (order_purchase_timestamp) "
+    "WHERE order_purchase_timestamp IS NOT NULL",
+    "CREATE INDEX IF NOT EXISTS idx_customers_state ON customers (customer_state)",
+]
+
+def with_session_options(url: str, options: str) -> str:
+    """
+    Add libpq session options (`-c name=value ...`) to a PostgreSQL URL, for
+    clients such as connectorx that open their own connections
+    
+    Args:
+        url: postgresql:// connection URL
+        options: Value for the libpq `options` parameter
+        
+    Returns:
+        URL with the options appended to its query string
+    """
+    parts = urlsplit(url)
+    query = f"{parts.query}&" if parts.query else ""
+    return urlunsplit(parts._replace(query=f"{query}options={quote(options, safe='')}"))
+
 class DatabaseManager:
     """
     Comprehensive class for managing PostgreSQL database
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        use_pool: bool = True,
+        statement_timeout_ms: Optional[int] = None,
+        pool_size: int = 16,
+        max_overflow: int = 20
+    ):
         """
         Initialize database using settings
+        
+        Args:
+            use_pool: Keep a connection pool; short-lived CLI scripts pass False
+                to open connections on demand instead
+            pool_size: Connections kept open in the pool; the default covers the
+                parallel import waves, callers with fixed concurrency can size it to that
+            max_overflow: Extra connections opened beyond pool_size under load
+            statement_timeout_ms: Cancel statements running longer than this
+                (0 disables it); defaults to DB_STATEMENT_TIMEOUT_MS
         """
+        settings = get_settings()
         self.database_url = settings.DATABASE_URL
+        self.use_pool = use_pool
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.statement_timeout_ms = (
+            settings.DB_STATEMENT_TIMEOUT_MS if statement_timeout_ms is None else statement_timeout_ms
+        )
+        # Applied to every connection: the engine's and connectorx's (read_frame)
+        self.session_options = (
+            f"-c statement_timeout={self.statement_timeout_ms} -c application_name=rag_analytics"
+        )
+        self.read_frame_url = with_session_options(self.database_url, self.session_options)
         self.engine = None
         self.SessionLocal = None
+        self._table_names = ()
         self._setup_logging()
     
     def _setup_logging(self):
@@ -36,11 +92,21 @@ class DatabaseManager:
             # Specific settings for PostgreSQL
             engine_kwargs = {
                 "echo": False,
-                "pool_size": 10,
-                "max_overflow": 20
+                # Cancel runaway queries server-side so they can't hold pooled connections
+                "connect_args": {"options": self.session_options}
             }
+            if self.use_pool:
+                engine_kwargs.update({
+                    "pool_size": self.pool_size,
+                    "max_overflow": self.max_overflow,
+                    "pool_pre_ping": True,
+                    "pool_recycle": 1800
+                })
+            else:
+                engine_kwargs["poolclass"] = NullPool
             
             self.engine = create_engine(self.database_url, **engine_kwargs)
+            self._table_names = tuple(Base.metadata.tables.keys())
             
             # Test connection
             with self.engine.connect() as connection:
@@ -77,6 +143,11 @@ class DatabaseManager:
         self.logger.info("Creating tables...")
         Base.metadata.create_all(bind=self.engine)
         
+        self.logger.info("Creating analytics indexes...")
+        with self.engine.begin() as connection:
+            for ddl in ANALYTICS_INDEXES:
+                connection.execute(text(ddl))
+        
         self.logger.info("Tables created successfully")
         return True
     
@@ -99,6 +170,23 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def read_frame(self, query: str) -> pd.DataFrame:
+        """
+        Run a read-only query straight into a DataFrame via connectorx,
+        skipping SQLAlchemy's per-row Python conversion. Columns stay
+        Arrow-backed, so strings are never materialized as Python objects.
+        connectorx opens its own connection, so the session options
+        (statement timeout) travel in its URL
+        
+        Args:
+            query: SQL query to execute
+            
+        Returns:
+            DataFrame with the query result
+        """
+        table = cx.read_sql(self.read_frame_url, query, return_type="arrow")
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    
     def test_connection(self) -> Dict[str, Any]:
         """
         Full connection and database status test
@@ -137,10 +225,14 @@ class DatabaseManager:
         
         return status
     
-    def get_table_info(self) -> Dict[str, int]:
+    def get_table_info(self, exact: bool = True) -> Dict[str, int]:
         """
         Information on record counts for each table
         
+        Args:
+            exact: Count rows with COUNT(*); when False, read the planner's
+                estimates from pg_class instead of scanning every table
+            
         Returns:
             Dict: Table name and record count
         """
@@ -150,13 +242,35 @@ class DatabaseManager:
             if self.engine is None:
                 return table_info
             
+            table_names = list(self._table_names)
+            
             with self.get_db_session() as session:
-                for table_name in Base.metadata.tables.keys():
-                    try:
-                        count = session.execute(text(f"SELECT COUNT(*) FROM {table_name}")).fetchone()[0]
+                if not exact:
+                    estimates = session.execute(
+                        text(
+                            "SELECT c.relname, c.reltuples::bigint FROM pg_class c "
+                            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                            "WHERE n.nspname = current_schema() AND c.relkind = 'r' "
+                            "AND c.relname = ANY(:names)"
+                        ),
+                        {"names": table_names}
+                    )
+                    for table_name, estimate in estimates:
+                        # reltuples is -1 until the table has been analyzed
+                        if estimate >= 0:
+                            table_info[table_name] = estimate
+                
+                # Count remaining tables in a single round-trip
+                to_count = [name for name in table_names if name not in table_info]
+                if to_count:
+                    query = " UNION ALL ".join(
+                        f"SELECT '{table_name}' AS table_name, COUNT(*) AS row_count FROM {table_name}"
+                        for table_name in to_count
+                    )
+                    for table_name, count in session.execute(text(query)):
                         table_info[table_name] = count
-                    except Exception as e:
-                        table_info[table_name] = f"Error: {str(e)}"
+            
+            table_info = {name: table_info[name] for name in table_names if name in table_info}
         
         except Exception as e:
             self.logger.error(f"Error retrieving table info: {str(e)}")
@@ -1,13 +1,99 @@
+import io
+import logging
+import multiprocessing
 import os
 import pandas as pd
 import numpy as np
-from typing import Dict
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+from sqlalchemy import insert, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
 from src.database.manager import DatabaseManager
 from src.models.models import (
-    Customer, Product, Seller, Order, OrderItem, 
+    Base, Customer, Product, Seller, Order, OrderItem, 
     Payment, Review, Geolocation, CategoryTranslation, SellerProduct
 )
 
+# Rows per CSV chunk / INSERT batch for the large files, and chunks per commit
+CHUNK_SIZE = 10_000
+COMMIT_EVERY = 10
+
+# Column types, keyed by CSV header (including the products file's typos).
+# Datetime columns are parsed while reading; unparseable cells stay text
+# and are coerced to null by clean_and_prepare_data
+DATETIME_COLUMNS = {
+    'orders': [
+        'order_purchase_timestamp',
+        'order_approved_at', 
+        'order_delivered_carrier_date',
+        'order_delivered_customer_date',
+        'order_estimated_delivery_date'
+    ],
+    'order_items': ['shipping_limit_date'],
+    'reviews': ['review_creation_date', 'review_answer_timestamp']
+}
+
+# Numeric columns are read untyped (a dtype= would make read_csv fail on a
+# bad cell) and converted to these dtypes in clean_and_prepare_data
+NUMERIC_DTYPES = {
+    # Integer counts in products are written as "40.0" and have gaps, so read them as floats
+    'products': {
+        'product_name_lenght': 'float64', 'product_description_lenght': 'float64',
+        'product_photos_qty': 'float64', 'product_weight_g': 'float64', 'product_length_cm': 'float64',
+        'product_height_cm': 'float64', 'product_width_cm': 'float64'
+    },
+    'order_items': {'order_item_id': 'Int64', 'price': 'float64', 'freight_value': 'float64'},
+    'payments': {'payment_sequential': 'Int64', 'payment_installments': 'Int64', 'payment_value': 'float64'},
+    'reviews': {'review_score': 'Int64'},
+    'geolocation': {'geolocation_lat': 'float64', 'geolocation_lng': 'float64'}
+}
+
+# Zip code prefixes are codes, not numbers: read them as text so leading zeros survive
+STRING_COLUMNS = {
+    'customers': ['customer_zip_code_prefix'],
+    'sellers': ['seller_zip_code_prefix'],
+    'geolocation': ['geolocation_zip_code_prefix']
+}
+
+# Files with free-text fields holding quoted line breaks (review comments),
+# which pyarrow's CSV reader can't split into blocks; read with the C engine
+MULTILINE_TEXT_TABLES = {'reviews'}
+
+# Fix column name typos in the products dataset
+PRODUCT_COLUMN_RENAMES = {
+    'product_name_lenght': 'product_name_length',
+    'product_description_lenght': 'product_description_length'
+}
+
+# Tables grouped by foreign-key dependencies; tables within a wave are independent
+IMPORT_WAVES = [
+    ['customers', 'products', 'sellers', 'geolocation', 'category_translation'],
+    ['orders'],
+    ['order_items', 'payments', 'reviews'],
+    ['seller_products']
+]
+
+def _run_import(args: Tuple[str, str, int]) -> Tuple[str, bool]:
+    """
+    Import one table in a worker process.
+    Engines don't survive crossing a process boundary, so each worker
+    connects with its own DatabaseManager.
+    """
+    archive_path, table_name, statement_timeout_ms = args
+    db_manager = DatabaseManager(use_pool=False, statement_timeout_ms=statement_timeout_ms)
+    if not db_manager.connect():
+        return table_name, False
+    
+    try:
+        importer = CSVImporter(db_manager=db_manager, archive_path=archive_path)
+        return table_name, getattr(importer, f"import_{table_name}")()
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error importing {table_name}: {str(e)}")
+        return table_name, False
+    finally:
+        db_manager.close_connection()
+
 class CSVImporter:
     """
     Comprehensive class for importing CSV data into the database
@@ -38,62 +124,50 @@ class CSVImporter:
             'category_translation': 'product_category_name_translation.csv'
         }
     
-    def clean_and_prepare_data(self, df: pd.DataFrame, table_name: str) -> pd.DataFrame:
+    def clean_and_prepare_data(self, df: pd.DataFrame, table_name: str, for_copy: bool = False) -> pd.DataFrame:
         """
         Clean and prepare data for import
         
+        Frames read through _read_csv arrive with clean datetime and numeric
+        columns already parsed; columns the parser left as text are coerced
+        (bad values become null) and numeric columns are cast to their
+        NUMERIC_DTYPES dtype. For INSERTs, only columns that
+        contain nulls are turned into object columns holding None, so the
+        driver sends NULL.
+        
         Args:
-            df: Raw DataFrame
+            df: Raw DataFrame (freshly read, modified in place)
             table_name: Target table name
+            for_copy: The frame goes through _copy_frame, whose CSV writer
+                already renders NaN/NaT as NULL; columns keep their typed
+                dtypes and the per-cell None conversion is skipped
             
         Returns:
             Cleaned DataFrame
         """
-        df_clean = df.copy()
-        
-        # Convert datetime columns
-        datetime_columns = {
-            'orders': [
-                'order_purchase_timestamp',
-                'order_approved_at', 
-                'order_delivered_carrier_date',
-                'order_delivered_customer_date',
-                'order_estimated_delivery_date'
-            ],
-            'order_items': ['shipping_limit_date'],
-            'reviews': ['review_creation_date', 'review_answer_timestamp']
-        }
-        
-        if table_name in datetime_columns:
-            for col in datetime_columns[table_name]:
-                if col in df_clean.columns:
-                    df_clean[col] = pd.to_datetime(df_clean[col], errors='coerce')
-        
-        # Convert numeric columns
-        numeric_columns = {
-            'products': [
-                'product_name_length', 'product_description_length',
-                'product_photos_qty', 'product_weight_g', 'product_length_cm',
-                'product_height_cm', 'product_width_cm'
-            ],
-            'order_items': ['order_item_id', 'price', 'freight_value'],
-            'payments': ['payment_sequential', 'payment_installments', 'payment_value'],
-            'reviews': ['review_score'],
-            'geolocation': ['geolocation_lat', 'geolocation_lng']
-        }
-        
-        if table_name in numeric_columns:
-            for col in numeric_columns[table_name]:
-                if col in df_clean.columns:
-                    # Handle typo in products dataset if present
-                    if table_name == 'products':
-                        if col == 'product_name_length' and 'product_name_lenght' in df_clean.columns:
-                             df_clean.rename(columns={'product_name_lenght': 'product_name_length'}, inplace=True)
-                        if col == 'product_description_length' and 'product_description_lenght' in df_clean.columns:
-                             df_clean.rename(columns={'product_description_lenght': 'product_description_length'}, inplace=True)
-                    
-                    if col in df_clean.columns:
-                        df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
+        if table_name == 'products':
+            df.rename(columns=PRODUCT_COLUMN_RENAMES, inplace=True)
+        
+        # Convert datetime columns the parser couldn't
+        for col in DATETIME_COLUMNS.get(table_name, []):
+            if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = pd.to_datetime(df[col], errors='coerce')
+        
+        # Convert numeric columns the parser couldn't, then settle their dtype
+        # (nullable Int64 keeps integer columns rendering as integers for COPY)
+        for col, dtype in NUMERIC_DTYPES.get(table_name, {}).items():
+            col = PRODUCT_COLUMN_RENAMES.get(col, col)
+            if col not in df.columns:
+                continue
+            if not pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+            if df[col].dtype != dtype:
+                df[col] = df[col].astype(dtype)
+        
+        # Cast code columns to text in one shot per column
+        for col in STRING_COLUMNS.get(table_name, []):
+            if col in df.columns and not isinstance(df[col].dtype, pd.StringDtype):
+                df[col] = df[col].astype("string")
         
         # Remove null values in primary keys
         primary_keys = {
@@ -104,263 +178,340 @@ class CSVImporter:
             'reviews': 'review_id'
         }
         
-        if table_name in primary_keys:
-            pk_col = primary_keys[table_name]
-            if pk_col in df_clean.columns:
-                df_clean = df_clean.dropna(subset=[pk_col])
+        pk_col = primary_keys.get(table_name)
+        if pk_col in df.columns:
+            df = df.dropna(subset=[pk_col])
         
-        df_clean = df_clean.replace([np.inf, -np.inf], np.nan)
+        float_cols = df.select_dtypes(include='float').columns
+        if len(float_cols):
+            df[float_cols] = df[float_cols].replace([np.inf, -np.inf], np.nan)
         
-        # Convert ALL columns to object to ensure we can store None, this must be rechecked for performance issues
-        df_clean = df_clean.astype(object)
+        if for_copy:
+            return df
         
-        df_clean = df_clean.where(pd.notnull(df_clean), None)
+        # Only columns with missing values need None instead of NaN/NaT
+        for col in df.columns[df.isna().any()]:
+            df[col] = df[col].astype(object).where(df[col].notna(), None)
         
-        return df_clean
+        return df
     
-    def import_customers(self) -> bool:
-        """Import customers table"""
-        file_path = os.path.join(self.archive_path, self.csv_files['customers'])
-        df = pd.read_csv(file_path)
-        df_clean = self.clean_and_prepare_data(df, 'customers')
-        
-        with self.db_manager.get_db_session() as session:
-            for _, row in df_clean.iterrows():
-                customer = Customer(
-                    customer_id=row['customer_id'],
-                    customer_unique_id=row['customer_unique_id'],
-                    customer_zip_code_prefix=str(row['customer_zip_code_prefix']),
-                    customer_city=row['customer_city'],
-                    customer_state=row['customer_state']
-                )
-                session.add(customer)
+    def _insert_frame(self, session, model, df: pd.DataFrame) -> int:
+        """
+        Insert a cleaned DataFrame with a single multi-row INSERT, or with
+        bulk_insert_mappings on dialects without multi-row VALUES support
+        
+        Args:
+            session: Active database session or connection
+            model: Target ORM model
+            df: Cleaned DataFrame (extra columns are ignored)
+            
+        Returns:
+            Number of inserted rows
+        """
+        columns = [column.name for column in model.__table__.columns if column.name in df.columns]
+        records = df[columns].to_dict(orient="records")
+        
+        if not records:
+            return 0
+        
+        dialect = session.get_bind().dialect if isinstance(session, Session) else session.dialect
+        if dialect.use_insertmanyvalues:
+            session.execute(insert(model.__table__), records)
+        else:
+            bulk_session = session if isinstance(session, Session) else Session(bind=session)
+            bulk_session.bulk_insert_mappings(model, records)
+        
+        return len(records)
+    
+    @contextmanager
+    def _transaction(self, connection: Optional[Connection] = None):
+        """
+        Run statements on the caller's connection (inside its transaction),
+        or in a session of their own when none is given
+        """
+        if connection is not None:
+            yield connection
+        else:
+            with self.db_manager.get_db_session() as session:
+                yield session
+    
+    def _bulk_insert(self, model, df: pd.DataFrame, connection: Optional[Connection] = None) -> int:
+        """Insert a cleaned DataFrame on the given connection, or in its own session"""
+        with self._transaction(connection) as session:
+            return self._insert_frame(session, model, df)
+    
+    @contextmanager
+    def _copy_cursor(self, connection: Optional[Connection] = None):
+        """
+        Raw psycopg2 cursor for COPY, committed on success and rolled back on error
+        
+        With a connection, the cursor runs inside that connection's
+        transaction and committing is left to its owner.
+        """
+        if connection is not None:
+            with connection.connection.cursor() as cursor:
+                yield cursor
+            return
+        
+        raw_connection = self.db_manager.engine.raw_connection()
+        try:
+            with raw_connection.cursor() as cursor:
+                yield cursor
+            raw_connection.commit()
+        except Exception as e:
+            raw_connection.rollback()
+            self.logger.error(f"Error in COPY: {str(e)}")
+            raise
+        finally:
+            raw_connection.close()
+    
+    def _copy_frame(self, cursor, model, df: pd.DataFrame, table_name: Optional[str] = None) -> int:
+        """
+        Stream a cleaned DataFrame into its table with PostgreSQL COPY FROM STDIN,
+        which skips per-row statement parsing and planning entirely
+        
+        Args:
+            cursor: Cursor from _copy_cursor
+            model: Target ORM model
+            df: Cleaned DataFrame (extra columns are ignored)
+            table_name: Table to copy into instead of the model's own (e.g. a staging table)
             
-        self.logger.info(f"{len(df_clean)} customers imported")
+        Returns:
+            Number of copied rows
+        """
+        columns = [column.name for column in model.__table__.columns if column.name in df.columns]
+        
+        buffer = io.StringIO()
+        df[columns].to_csv(buffer, index=False, header=False, na_rep='\\N')
+        buffer.seek(0)
+        
+        cursor.copy_expert(
+            f"COPY {table_name or model.__tablename__} ({', '.join(columns)}) FROM STDIN WITH (FORMAT CSV, NULL '\\N')",
+            buffer
+        )
+        return len(df)
+    
+    def _read_csv(self, table_name: str, **kwargs):
+        """
+        Read a table's CSV with its text and datetime columns declared
+        up front, so they are parsed in a single pass
+        
+        Whole files go through the multithreaded pyarrow parser. The C
+        parser is used for chunked reads (chunksize=...), which pyarrow
+        doesn't support; for files with STRING_COLUMNS, since the pyarrow
+        engine infers zip codes as integers (losing leading zeros) and only
+        casts them to text afterwards; and for MULTILINE_TEXT_TABLES.
+        """
+        file_path = os.path.join(self.archive_path, self.csv_files[table_name])
+        dtypes = {col: "string" for col in STRING_COLUMNS.get(table_name, [])}
+        dates = DATETIME_COLUMNS.get(table_name)
+        
+        use_c_engine = (
+            'chunksize' in kwargs
+            or table_name in STRING_COLUMNS
+            or table_name in MULTILINE_TEXT_TABLES
+        )
+        engine = 'c' if use_c_engine else 'pyarrow'
+        return pd.read_csv(file_path, engine=engine, dtype=dtypes or None, parse_dates=dates, **kwargs)
+    
+    def _read_chunks(self, table_name: str, **kwargs):
+        """Stream a CSV in CHUNK_SIZE row chunks instead of loading it whole"""
+        return self._read_csv(table_name, chunksize=CHUNK_SIZE, **kwargs)
+    
+    def import_customers(self, connection: Optional[Connection] = None) -> bool:
+        """Import customers table"""
+        df = self._read_csv('customers')
+        df_clean = self.clean_and_prepare_data(df, 'customers', for_copy=True)
+        
+        with self._copy_cursor(connection) as cursor:
+            count = self._copy_frame(cursor, Customer, df_clean)
+        self.logger.info(f"{count} customers imported")
         return True
     
-    def import_products(self) -> bool:
+    def import_products(self, connection: Optional[Connection] = None) -> bool:
         """Import products table"""
-        file_path = os.path.join(self.archive_path, self.csv_files['products'])
-        df = pd.read_csv(file_path)
+        df = self._read_csv('products')
         df_clean = self.clean_and_prepare_data(df, 'products')
         
-        with self.db_manager.get_db_session() as session:
-            for _, row in df_clean.iterrows():
-                # Handle potential column name mismatches (typos in CSV)
-                name_len = row.get('product_name_length') if 'product_name_length' in row else row.get('product_name_lenght')
-                desc_len = row.get('product_description_length') if 'product_description_length' in row else row.get('product_description_lenght')
-                
-                product = Product(
-                    product_id=row['product_id'],
-                    product_category_name=row.get('product_category_name'),
-                    product_name_length=name_len,
-                    product_description_length=desc_len,
-                    product_photos_qty=row.get('product_photos_qty'),
-                    product_weight_g=row.get('product_weight_g'),
-                    product_length_cm=row.get('product_length_cm'),
-                    product_height_cm=row.get('product_height_cm'),
-                    product_width_cm=row.get('product_width_cm')
-                )
-                session.add(product)
-        
-        self.logger.info(f"{len(df_clean)} products imported")
+        count = self._bulk_insert(Product, df_clean, connection)
+        self.logger.info(f"{count} products imported")
         return True
     
-    def import_sellers(self) -> bool:
+    def import_sellers(self, connection: Optional[Connection] = None) -> bool:
         """Import sellers table"""
-        file_path = os.path.join(self.archive_path, self.csv_files['sellers'])
-        df = pd.read_csv(file_path)
+        df = self._read_csv('sellers')
         df_clean = self.clean_and_prepare_data(df, 'sellers')
         
-        with self.db_manager.get_db_session() as session:
-            for _, row in df_clean.iterrows():
-                seller = Seller(
-                    seller_id=row['seller_id'],
-                    seller_zip_code_prefix=str(row['seller_zip_code_prefix']),
-                    seller_city=row['seller_city'],
-                    seller_state=row['seller_state']
-                )
-                session.add(seller)
-        
-        self.logger.info(f"{len(df_clean)} sellers imported")
+        count = self._bulk_insert(Seller, df_clean, connection)
+        self.logger.info(f"{count} sellers imported")
         return True
     
-    def import_orders(self) -> bool:
+    def import_orders(self, connection: Optional[Connection] = None) -> bool:
         """Import orders table"""
-        file_path = os.path.join(self.archive_path, self.csv_files['orders'])
-        df = pd.read_csv(file_path)
-        df_clean = self.clean_and_prepare_data(df, 'orders')
-        
-        with self.db_manager.get_db_session() as session:
-            for _, row in df_clean.iterrows():
-                order = Order(
-                    order_id=row['order_id'],
-                    customer_id=row['customer_id'],
-                    order_status=row['order_status'],
-                    order_purchase_timestamp=row.get('order_purchase_timestamp'),
-                    order_approved_at=row.get('order_approved_at'),
-                    order_delivered_carrier_date=row.get('order_delivered_carrier_date'),
-                    order_delivered_customer_date=row.get('order_delivered_customer_date'),
-                    order_estimated_delivery_date=row.get('order_estimated_delivery_date')
-                )
-                session.add(order)
-        
-        self.logger.info(f"{len(df_clean)} orders imported")
+        df = self._read_csv('orders')
+        df_clean = self.clean_and_prepare_data(df, 'orders', for_copy=True)
+        
+        with self._copy_cursor(connection) as cursor:
+            count = self._copy_frame(cursor, Order, df_clean)
+        self.logger.info(f"{count} orders imported")
         return True
 
-    def import_order_items(self) -> bool:
+    def import_order_items(self, connection: Optional[Connection] = None) -> bool:
         """Import order_items table"""
-        file_path = os.path.join(self.archive_path, self.csv_files['order_items'])
-        df = pd.read_csv(file_path)
-        df_clean = self.clean_and_prepare_data(df, 'order_items')
-        
-        with self.db_manager.get_db_session() as session:
-            for _, row in df_clean.iterrows():
-                order_item = OrderItem(
-                    order_id=row['order_id'],
-                    order_item_id=row['order_item_id'],
-                    product_id=row['product_id'],
-                    seller_id=row['seller_id'],
-                    shipping_limit_date=row.get('shipping_limit_date'),
-                    price=row.get('price'),
-                    freight_value=row.get('freight_value')
-                )
-                session.add(order_item)
-        
-        self.logger.info(f"{len(df_clean)} order items imported")
+        count = 0
+        with self._copy_cursor(connection) as cursor:
+            for chunk in self._read_chunks('order_items'):
+                df_clean = self.clean_and_prepare_data(chunk, 'order_items', for_copy=True)
+                count += self._copy_frame(cursor, OrderItem, df_clean)
+        
+        self.logger.info(f"{count} order items imported")
         return True
 
-    def import_payments(self) -> bool:
+    def import_payments(self, connection: Optional[Connection] = None) -> bool:
         """Import payments table"""
-        file_path = os.path.join(self.archive_path, self.csv_files['payments'])
-        df = pd.read_csv(file_path)
-        df_clean = self.clean_and_prepare_data(df, 'payments')
-        
-        with self.db_manager.get_db_session() as session:
-            for _, row in df_clean.iterrows():
-                payment = Payment(
-                    order_id=row['order_id'],
-                    payment_sequential=row['payment_sequential'],
-                    payment_type=row['payment_type'],
-                    payment_installments=row['payment_installments'],
-                    payment_value=row['payment_value']
-                )
-                session.add(payment)
-        
-        self.logger.info(f"{len(df_clean)} payments imported")
+        count = 0
+        with self._transaction(connection) as session:
+            for i, chunk in enumerate(self._read_chunks('payments'), start=1):
+                df_clean = self.clean_and_prepare_data(chunk, 'payments')
+                count += self._insert_frame(session, Payment, df_clean)
+                if connection is None and i % COMMIT_EVERY == 0:
+                    session.commit()
+        
+        self.logger.info(f"{count} payments imported")
         return True
 
-    def import_reviews(self) -> bool:
+    def import_reviews(self, connection: Optional[Connection] = None) -> bool:
         """Import reviews table"""
-        file_path = os.path.join(self.archive_path, self.csv_files['reviews'])
-        df = pd.read_csv(file_path)
+        df = self._read_csv('reviews')
         df_clean = self.clean_and_prepare_data(df, 'reviews')
         
-        with self.db_manager.get_db_session() as session:
-            for _, row in df_clean.iterrows():
-                review = Review(
-                    review_id=row['review_id'],
-                    order_id=row['order_id'],
-                    review_score=row.get('review_score'),
-                    review_comment_title=row.get('review_comment_title'),
-                    review_comment_message=row.get('review_comment_message'),
-                    review_creation_date=row.get('review_creation_date'),
-                    review_answer_timestamp=row.get('review_answer_timestamp')
-                )
-                session.add(review)
-        
-        self.logger.info(f"{len(df_clean)} reviews imported")
+        count = self._bulk_insert(Review, df_clean, connection)
+        self.logger.info(f"{count} reviews imported")
         return True
 
-    def import_geolocation(self) -> bool:
+    def import_geolocation(self, connection: Optional[Connection] = None) -> bool:
         """Import geolocation table"""
-        file_path = os.path.join(self.archive_path, self.csv_files['geolocation'])
-        df = pd.read_csv(file_path)
-        df_clean = self.clean_and_prepare_data(df, 'geolocation')
-        
-        # Remove duplicates based on zip_code
-        df_clean = df_clean.drop_duplicates(subset=['geolocation_zip_code_prefix'])
-        
-        with self.db_manager.get_db_session() as session:
-            for _, row in df_clean.iterrows():
-                geolocation = Geolocation(
-                    geolocation_zip_code_prefix=str(row['geolocation_zip_code_prefix']),
-                    geolocation_lat=row.get('geolocation_lat'),
-                    geolocation_lng=row.get('geolocation_lng'),
-                    geolocation_city=row.get('geolocation_city'),
-                    geolocation_state=row.get('geolocation_state')
-                )
-                session.add(geolocation)
-        
-        self.logger.info(f"{len(df_clean)} geolocations imported")
+        table = Geolocation.__tablename__
+        columns = ', '.join(column.name for column in Geolocation.__table__.columns if not column.primary_key)
+        
+        with self._copy_cursor(connection) as cursor:
+            # COPY every row into a staging table, then let the unique zip code
+            # constraint drop the duplicates server-side (first row per zip code wins)
+            cursor.execute(
+                f"CREATE TEMP TABLE {table}_stage ON COMMIT DROP AS "
+                f"SELECT {columns} FROM {table} WITH NO DATA"
+            )
+            for chunk in self._read_chunks('geolocation'):
+                df_clean = self.clean_and_prepare_data(chunk, 'geolocation', for_copy=True)
+                self._copy_frame(cursor, Geolocation, df_clean, table_name=f"{table}_stage")
+            
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_stage "
+                "ON CONFLICT (geolocation_zip_code_prefix) DO NOTHING"
+            )
+            count = cursor.rowcount
+        
+        self.logger.info(f"{count} geolocations imported")
         return True
 
-    def import_category_translation(self) -> bool:
+    def import_category_translation(self, connection: Optional[Connection] = None) -> bool:
         """Import category_translation table"""
-        file_path = os.path.join(self.archive_path, self.csv_files['category_translation'])
-        df = pd.read_csv(file_path)
+        df = self._read_csv('category_translation')
         df_clean = self.clean_and_prepare_data(df, 'category_translation')
         
-        with self.db_manager.get_db_session() as session:
-            for _, row in df_clean.iterrows():
-                category = CategoryTranslation(
-                    product_category_name=row['product_category_name'],
-                    product_category_name_english=row['product_category_name_english']
-                )
-                session.add(category)
-        
-        self.logger.info(f"{len(df_clean)} category translations imported")
+        count = self._bulk_insert(CategoryTranslation, df_clean, connection)
+        self.logger.info(f"{count} category translations imported")
         return True
     
-    def import_seller_products(self) -> bool:
-        """Derive seller-product relationships from order_items"""
-        file_path = os.path.join(self.archive_path, self.csv_files['order_items'])
-        df = pd.read_csv(file_path)
-        
-        # Extract unique pairs of seller_id and product_id
-        df_unique = df[['seller_id', 'product_id']].drop_duplicates()
-        
-        with self.db_manager.get_db_session() as session:
-            for _, row in df_unique.iterrows():
-                seller_product = SellerProduct(
-                    seller_id=row['seller_id'],
-                    product_id=row['product_id']
-                )
-                session.add(seller_product)
-        
-        self.logger.info(f"{len(df_unique)} seller-product relationships imported")
+    def import_seller_products(self, connection: Optional[Connection] = None) -> bool:
+        """Derive seller-product relationships from the imported order_items"""
+        # Deduplicate server-side; no rows travel to Python and back
+        with self._transaction(connection) as session:
+            result = session.execute(text(
+                f"INSERT INTO {SellerProduct.__tablename__} (seller_id, product_id) "
+                f"SELECT DISTINCT seller_id, product_id FROM {OrderItem.__tablename__} "
+                "WHERE seller_id IS NOT NULL AND product_id IS NOT NULL"
+            ))
+            count = result.rowcount
+        
+        self.logger.info(f"{count} seller-product relationships imported")
         return True
     
-    def import_all_data(self) -> Dict[str, bool]:
+    def _secondary_indexes(self):
+        """Indexes declared on the models (index=True); primary keys are constraints, not listed here"""
+        return [index for table in Base.metadata.sorted_tables for index in table.indexes]
+    
+    def _drop_secondary_indexes(self):
+        """Drop secondary indexes so the bulk load doesn't maintain them row by row"""
+        for index in self._secondary_indexes():
+            index.drop(bind=self.db_manager.engine, checkfirst=True)
+    
+    def _recreate_secondary_indexes(self):
+        """Rebuild the secondary indexes in one pass over the loaded tables"""
+        for index in self._secondary_indexes():
+            index.create(bind=self.db_manager.engine, checkfirst=True)
+    
+    def import_all_data(self, parallel: bool = True) -> Dict[str, bool]:
         """
         Import all data in proper order
         
+        Tables are imported wave by wave (see IMPORT_WAVES). By default the
+        tables of a wave run in parallel worker processes, overlapping CSV
+        parsing and database round-trips across cores; each table commits
+        on its own.
+        
+        Args:
+            parallel: When False, import every table sequentially inside one
+                transaction instead: a single commit for the whole load, and
+                nothing is kept if any table fails
+        
         Returns:
             Dict: Import result for each table
         """
         results = {}
         
-        # Import order based on foreign key dependencies
-        import_order = [
-            ('customers', self.import_customers),
-            ('products', self.import_products),
-            ('sellers', self.import_sellers),
-            ('orders', self.import_orders),
-            ('order_items', self.import_order_items),
-            ('payments', self.import_payments),
-            ('reviews', self.import_reviews),
-            ('geolocation', self.import_geolocation),
-            ('category_translation', self.import_category_translation),
-            ('seller_products', self.import_seller_products)
-        ]
-        
         self.logger.info("Starting import of all data...")
         
-        for table_name, import_func in import_order:
-            self.logger.info(f"Importing {table_name}...")
-            results[table_name] = import_func()
-            
-            if not results[table_name]:
-                self.logger.warning(f"Error importing {table_name} - continuing with next table")
+        self.logger.info("Dropping secondary indexes for the bulk load...")
+        self._drop_secondary_indexes()
+        
+        try:
+            if parallel:
+                self._import_waves_parallel(results)
+            else:
+                self._import_waves_single_transaction(results)
+        finally:
+            self.logger.info("Rebuilding secondary indexes...")
+            self._recreate_secondary_indexes()
         
         return results
+    
+    def _import_waves_parallel(self, results: Dict[str, bool]):
+        """Import each wave's tables concurrently in worker processes"""
+        # spawn, not fork: forked children would share the parent's pooled sockets
+        context = multiprocessing.get_context("spawn")
+        
+        for wave in IMPORT_WAVES:
+            self.logger.info(f"Importing {', '.join(wave)}...")
+            tasks = [(self.archive_path, table_name, self.db_manager.statement_timeout_ms) for table_name in wave]
+            
+            with context.Pool(processes=min(len(wave), os.cpu_count() or 1)) as pool:
+                for table_name, ok in pool.imap_unordered(_run_import, tasks):
+                    results[table_name] = ok
+                    
+                    if not ok:
+                        self.logger.warning(f"Error importing {table_name} - continuing with next table")
+    
+    def _import_waves_single_transaction(self, results: Dict[str, bool]):
+        """Import every table in order on one connection and commit once at the end"""
+        table_names = [table_name for wave in IMPORT_WAVES for table_name in wave]
+        
+        try:
+            with self.db_manager.engine.begin() as connection:
+                for table_name in table_names:
+                    self.logger.info(f"Importing {table_name}...")
+                    results[table_name] = getattr(self, f"import_{table_name}")(connection)
+        except Exception as e:
+            # The transaction was rolled back, so no table kept its rows
+            self.logger.error(f"Error importing data, nothing was committed: {str(e)}")
+            results.update({table_name: False for table_name in table_names})
@@ -1,5 +1,5 @@
-import pandas as pd
 import os
+from typing import Optional
 from src.database.manager import DatabaseManager
 
 class RAGDataExtractor:
@@ -11,13 +11,24 @@ class RAGDataExtractor:
         self.db_manager = db_manager
         self.logger = db_manager.logger
 
-    def extract_reviews(self, limit: int = 1000, output_path: str = 'rag_text_data.csv') -> pd.DataFrame:
+    def extract_reviews(self, limit: Optional[int] = 1000, output_path: str = 'rag_text_data.csv') -> int:
         """
         Extract review comments and titles for RAG processing.
+        Rows are streamed by PostgreSQL's COPY straight into the CSV file,
+        without building Python row objects or a DataFrame.
+        
+        Args:
+            limit: Maximum number of reviews to extract (None extracts all)
+            output_path: CSV file to write
+        
+        Returns:
+            Number of reviews written (0 on failure)
         """
-        query = f"""
+        # uuid columns read back hyphenated; strip the hyphens so review ids
+        # match the 32-character hex ids of the source CSVs
+        query = """
         SELECT 
-            r.review_id,
+            replace(r.review_id::text, '-', '') AS review_id,
             r.review_comment_title,
             r.review_comment_message,
             r.review_score,
@@ -27,20 +38,29 @@ class RAGDataExtractor:
         JOIN order_items oi ON o.order_id = oi.order_id
         JOIN products p ON oi.product_id = p.product_id
         WHERE r.review_comment_message IS NOT NULL
-        LIMIT {limit};
+        LIMIT %(limit)s
         """
         
         try:
-            df = pd.read_sql(query, self.db_manager.engine)
-            self.logger.info(f"Extracted {len(df)} reviews for RAG processing")
+            raw_connection = self.db_manager.engine.raw_connection()
+            try:
+                with raw_connection.cursor() as cursor, open(output_path, 'wb') as f:
+                    # COPY takes no server-side parameters, so bind the limit client-side (NULL means no limit)
+                    bound_query = cursor.mogrify(query, {"limit": limit}).decode()
+                    cursor.copy_expert(f"COPY ({bound_query}) TO STDOUT WITH (FORMAT CSV, HEADER)", f)
+                    row_count = cursor.rowcount
+            finally:
+                raw_connection.close()
+            
+            self.logger.info(f"Extracted {row_count} reviews for RAG processing")
             
-            if not df.empty:
-                df.to_csv(output_path, index=False)
+            if row_count > 0:
                 self.logger.info(f"Saved extracted text to '{output_path}'")
             else:
                 self.logger.warning("No reviews found to extract.")
+                os.remove(output_path)
                 
-            return df
+            return row_count
         except Exception as e:
             self.logger.error(f"Error extracting reviews: {e}")
-            return pd.DataFrame()
+            return 0
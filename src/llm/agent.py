@@ -1,18 +1,45 @@
-from typing import TypedDict, Annotated, List, Union
+from typing import TypedDict, Annotated, List, Optional, Union
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 from langgraph.graph import StateGraph, END
 from sqlalchemy import text
-import pandas as pd
-from src.monitoring.metrics import llm_tokens_total, agent_response_time_seconds
-from prometheus_client import start_http_server
+from diskcache import Cache
+from src.monitoring.metrics import BatchCounter, inc_tokens, mono_time, start_metrics_server, start_metrics_uds, time_agent_run
 import os
-import time
+import re
 
 from src.database.manager import DatabaseManager
-from src.llm.prompts import get_system_prompt
-from src.llm.schema_generator import generate_schema_description
-from src.config.settings import settings
+from src.llm.prompts import cached_system_prompt
+from src.llm.schema_generator import schema_fingerprint
+
+# Chat model used by the agent; also the model label on its token metrics
+LLM_MODEL = "gpt-4o"
+
+# Rows handed back to the LLM; larger results are truncated to bound its context
+MAX_RESULT_ROWS = 200
+_WHITESPACE_RE = re.compile(r"\s+")
+# Markdown code fences the model sometimes wraps its SQL in (```sql, ```SQL, ```postgres, bare ```)
+_FENCE_RE = re.compile(r"```(?:sql|postgres(?:ql)?)?\s*|\s*```", re.IGNORECASE)
+
+def format_markdown_table(columns, rows) -> str:
+    """
+    Render query rows as a Markdown table without building a DataFrame.
+    """
+    def cell(value):
+        return "" if value is None else str(value).replace("|", "\\|")
+    
+    lines = [
+        "| " + " | ".join(map(cell, columns)) + " |",
+        "|" + "|".join(["---"] * len(columns)) + "|"
+    ]
+    lines.extend("| " + " | ".join(map(cell, row)) + " |" for row in rows)
+    return "\n".join(lines)
+
+INSIGHT_SYSTEM_PROMPT = (
+    "You are a business analyst. Based on the following SQL result and user question, "
+    "write a short, clear business insight in Persian or English. "
+    "Focus on trends, anomalies, or actionable findings."
+)
 
 # Define the State
 class AgentState(TypedDict):
@@ -21,19 +48,32 @@ class AgentState(TypedDict):
     query_result: str
     error: str
     attempts: int
+    token_count: int
 
 class SQLAgent:
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
-        self.llm = ChatOpenAI(model="gpt-4o", temperature=0)
+        self.llm = ChatOpenAI(model=LLM_MODEL, temperature=0)
         
         if os.environ.get("PROMETHEUS_METRICS", "1") == "1":
-            start_http_server(8000)
+            # A local Prometheus can scrape over a UNIX socket instead of TCP
+            metrics_socket = os.environ.get("PROMETHEUS_METRICS_SOCKET")
+            if metrics_socket:
+                start_metrics_uds(metrics_socket)
+            else:
+                start_metrics_server(8000)
  
         
-        # Generate Schema Context once during initialization
-        self.schema_context = generate_schema_description(self.db_manager.engine)
-        self.system_prompt = get_system_prompt(self.schema_context)
+        # Build the schema-aware system prompt once during initialization (cached on disk per schema)
+        self.schema_fingerprint = schema_fingerprint(self.db_manager.engine)
+        self.system_prompt = cached_system_prompt(self.db_manager.engine, key=self.schema_fingerprint)
+        
+        # Working SQL per question, so repeated questions skip the LLM
+        self.sql_cache = Cache(".cache/sql")
+        
+        # System messages never change, so build them once and reuse them on every call
+        self._system_msg = SystemMessage(content=self.system_prompt)
+        self._insight_system_msg = SystemMessage(content=INSIGHT_SYSTEM_PROMPT)
         
         # Build the Graph
         self.workflow = self._build_graph()
@@ -42,20 +82,16 @@ class SQLAgent:
         workflow = StateGraph(AgentState)
 
         # Add Nodes
-        workflow.add_node("analyze_question", self.analyze_question)
         workflow.add_node("generate_sql", self.generate_sql)
         workflow.add_node("execute_query", self.execute_query)
-        workflow.add_node("validate_result", self.validate_result)
 
         # Add Edges
-        workflow.set_entry_point("analyze_question")
-        workflow.add_edge("analyze_question", "generate_sql")
+        workflow.set_entry_point("generate_sql")
         workflow.add_edge("generate_sql", "execute_query")
-        workflow.add_edge("execute_query", "validate_result")
         
-        # Conditional Edge for Validation
+        # Conditional Edge for Validation (retry generation on error)
         workflow.add_conditional_edges(
-            "validate_result",
+            "execute_query",
             self.check_validity,
             {
                 "valid": END,
@@ -65,70 +101,100 @@ class SQLAgent:
 
         return workflow.compile()
 
-    # Node Functions
-
-    def analyze_question(self, state: AgentState):
+    def prime(self, connections: int = 1):
+        """
+        Open pooled database connections ahead of the first question, so it
+        doesn't pay connect/auth latency. The LLM client and system message
+        are already built once in __init__ (the API takes prompt text, so
+        there is nothing to pre-tokenize).
+        
+        Args:
+            connections: Number of pool connections to open (one per concurrent run)
+        """
+        opened = []
+        try:
+            for _ in range(connections):
+                opened.append(self.db_manager.engine.connect())
+        finally:
+            # Closing returns them to the pool, still connected
+            for connection in opened:
+                connection.close()
+
+    def _cache_key(self, question: str) -> str:
         """
-        Node 1: Analyze the user's question to ensure it's relevant to the database.
-        (Currently a pass-through, but can be expanded to filter non-SQL questions)
+        Cache key for a question: normalized text plus the schema it was answered against.
         """
-        # In a real scenario, we might check if the question is about e-commerce.
-        return {"attempts": 0}
+        normalized = _WHITESPACE_RE.sub(" ", question.strip().lower())
+        return f"{self.schema_fingerprint}:{normalized}"
+
+    # Node Functions
 
     def generate_sql(self, state: AgentState):
         """
-        Node 2: Generate SQL query based on the question and schema.
+        Node 1: Generate SQL query based on the question and schema.
         """
         question = state['question']
         error = state.get('error')
         
+        # Retries after an error must go back to the LLM
+        if not error:
+            sql_query = self.sql_cache.get(self._cache_key(question))
+            if sql_query is not None:
+                return {"sql_query": sql_query, "attempts": state.get("attempts", 0) + 1}
+        
         messages = [
-            SystemMessage(content=self.system_prompt),
+            self._system_msg,
             HumanMessage(content=question)
         ]
         
         if error:
             messages.append(HumanMessage(content=f"The previous query resulted in an error: {error}. Please fix the SQL."))
 
-        start_time = time.time()
-        response = self.llm.invoke(messages)
-        duration = time.time() - start_time
+        with mono_time("generate_sql"):
+            response = self.llm.invoke(messages)
         
-        # Try to log token usage if available
-        token_count = getattr(response, 'usage', {}).get('total_tokens', 0)
-        llm_tokens_total.labels(model="gpt-4o", operation="completion").inc(token_count)
-        agent_response_time_seconds.labels(operation="generate_sql").observe(duration)
+        # Token usage is summed over the run and reported once by run()
+        token_count = (response.usage_metadata or {}).get('total_tokens', 0)
         
-        sql_query = response.content.strip().replace("```sql", "").replace("```", "")
+        sql_query = _FENCE_RE.sub("", response.content).strip()
         
-        return {"sql_query": sql_query, "attempts": state.get("attempts", 0) + 1}
+        return {
+            "sql_query": sql_query,
+            "attempts": state.get("attempts", 0) + 1,
+            "token_count": state.get("token_count", 0) + token_count
+        }
 
     def execute_query(self, state: AgentState):
         """
-        Node 3: Execute the generated SQL query against the database.
+        Node 2: Execute the generated SQL query against the database.
         """
         sql_query = state['sql_query']
         
         try:
-            df = pd.read_sql(sql_query, self.db_manager.engine)
+            with self.db_manager.engine.connect() as connection:
+                result = connection.execute(text(sql_query))
+                columns = list(result.keys())
+                # Runs the model's SQL as written; one extra row tells whether it was truncated
+                rows = result.fetchmany(MAX_RESULT_ROWS + 1)
+            
+            # Only SQL that ran successfully is worth reusing
+            self.sql_cache.set(self._cache_key(state['question']), state['sql_query'])
             
-            if df.empty:
+            if not rows:
                 return {"query_result": "No data found.", "error": None}
             
-            return {"query_result": df.to_markdown(index=False), "error": None}
+            query_result = format_markdown_table(columns, rows[:MAX_RESULT_ROWS])
+            if len(rows) > MAX_RESULT_ROWS:
+                query_result += f"\n\n(Showing the first {MAX_RESULT_ROWS} rows only.)"
+            
+            return {"query_result": query_result, "error": None}
             
         except Exception as e:
             return {"query_result": None, "error": str(e)}
 
-    def validate_result(self, state: AgentState):
-        """
-        Node 4: Check if the execution was successful.
-        """
-        return {}
-
     def check_validity(self, state: AgentState):
         """
-        Conditional logic to determine next step.
+        Conditional logic to determine next step after executing the query.
         """
         if state.get("error"):
             if state["attempts"] >= 3:
@@ -137,26 +203,33 @@ class SQLAgent:
         
         return "valid"
 
-    def run(self, question: str):
+    def run(self, question: str, token_counter: Optional[BatchCounter] = None):
         """
         Entry point to run the agent.
+        
+        Args:
+            question: User question
+            token_counter: Batch the run's token usage into this counter
+                (flushed by the caller) instead of incrementing the metric directly
         """
-        with agent_response_time_seconds.labels(operation="agent_run").time():
-            initial_state = {"question": question, "attempts": 0, "error": None}
+        with time_agent_run():
+            initial_state = {"question": question, "attempts": 0, "error": None, "token_count": 0}
             result = self.workflow.invoke(initial_state)
+        
+        # Tokens are summed over the run's LLM calls and reported once per run
+        token_count = result.get("token_count", 0)
+        if token_counter is not None:
+            token_counter.add((LLM_MODEL, "completion"), token_count)
+        else:
+            inc_tokens(LLM_MODEL, "completion", token_count)
         return result
 
     def generate_insight(self, sql_result: str, question: str) -> str:
         """
         Generate a business insight based on the SQL result and user question using LLM.
         """
-        system_prompt = (
-            "You are a business analyst. Based on the following SQL result and user question, "
-            "write a short, clear business insight in Persian or English. "
-            "Focus on trends, anomalies, or actionable findings."
-        )
         messages = [
-            SystemMessage(content=system_prompt),
+            self._insight_system_msg,
             HumanMessage(content=f"User Question: {question}\nSQL Result:\n{sql_result}")
         ]
         response = self.llm.invoke(messages)
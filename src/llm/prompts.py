@@ -1,17 +1,37 @@
-from typing import List, Dict
+import hashlib
+import os
+from typing import List, Dict, Optional
+from sqlalchemy.engine import Engine
+from src.llm.schema_generator import generate_schema_description_cached, schema_fingerprint, write_cache_file
 
-def get_system_prompt(schema_info: str) -> str:
+def cached_system_prompt(engine: Engine, key: Optional[str] = None, cache_dir: str = ".cache") -> str:
     """
-    Generates the system prompt for the SQL Agent.
+    System prompt for the current database schema, cached on disk.
+    The file name hashes the schema fingerprint (key, computed when omitted)
+    and this module's mtime, so both schema and prompt edits invalidate it.
     """
+    key = key or schema_fingerprint(engine)
+    digest = hashlib.sha256(f"{key}:{os.path.getmtime(__file__)}".encode("utf-8")).hexdigest()
+    cache_path = os.path.join(cache_dir, f"prompt-{digest}.txt")
     
-    return f"""
+    if os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as f:
+            return f.read()
+    
+    prompt = get_system_prompt(generate_schema_description_cached(engine, key=key))
+    write_cache_file(cache_path, prompt)
+    return prompt
+
+# The prompt is kept as sections around the schema so it can be streamed
+_PROMPT_HEADER = """
 You are an expert Data Analyst and SQL Developer for an E-commerce platform (Olist Store).
 Your goal is to convert natural language questions (in English or Persian) into executable PostgreSQL queries.
 
 ### Database Schema
 The database contains the following tables and relationships:
-{schema_info}
+"""
+
+_PROMPT_GUIDE = """
 
 ### Business Definitions & Metrics (Domain Knowledge)
 Use these definitions when generating queries for specific business terms:
@@ -40,6 +60,7 @@ Use these definitions when generating queries for specific business terms:
    - Example: "مشتری" -> `customers` table, "قیمت" -> `price` or `payment_value`.
 4. **Joins**: Always use explicit `JOIN` clauses. Ensure you join on the correct Foreign Keys (e.g., `orders.customer_id = customers.customer_id`).
 5. **Ambiguity**: If a question is ambiguous, choose the most common e-commerce interpretation (e.g., "best products" usually means highest sales volume).
+6. **Ids**: `customer_id`, `customer_unique_id`, `order_id`, `product_id`, `seller_id` and `review_id` are `UUID` columns. Compare them with quoted literals (e.g., `order_id = 'e481f51cbdc54678b7cc49136f2d6af7'`) and cast with `::text` before using string functions or `LIKE`. PostgreSQL returns them hyphenated; when ids are part of the output, select `replace(<id>::text, '-', '')` so they match the 32-character ids users know.
 
 ### Few-Shot Examples (Training Data)
 
@@ -85,3 +106,18 @@ GROUP BY month
 ORDER BY month;
 
 """
+
+def get_system_prompt_iter(schema_info: str):
+    """
+    Yields the system prompt for the SQL Agent section by section,
+    so it can be written out without building the full string.
+    """
+    yield _PROMPT_HEADER
+    yield schema_info
+    yield _PROMPT_GUIDE
+
+def get_system_prompt(schema_info: str) -> str:
+    """
+    Generates the system prompt for the SQL Agent.
+    """
+    return "".join(get_system_prompt_iter(schema_info))
@@ -1,5 +1,8 @@
+import hashlib
+import os
+from typing import Optional
 from sqlalchemy.engine import Engine
-from sqlalchemy import inspect
+from sqlalchemy import inspect, text
 
 def generate_schema_description(engine: Engine) -> str:
     """
@@ -29,3 +32,44 @@ def generate_schema_description(engine: Engine) -> str:
         schema_text.append("") # Empty line between tables
         
     return "\n".join(schema_text)
+
+def schema_fingerprint(engine: Engine) -> str:
+    """
+    Cheap hash of the current schema's tables and columns (one round-trip).
+    """
+    query = text(
+        "SELECT table_name, column_name, data_type FROM information_schema.columns "
+        "WHERE table_schema = current_schema() ORDER BY table_name, ordinal_position"
+    )
+    with engine.connect() as connection:
+        rows = connection.execute(query).fetchall()
+    
+    return hashlib.md5("|".join(":".join(row) for row in rows).encode("utf-8")).hexdigest()
+
+def generate_schema_description_cached(engine: Engine, cache_path: str = ".cache/schema.txt", key: Optional[str] = None) -> str:
+    """
+    Same as generate_schema_description, but reuses the last result stored at
+    cache_path while the schema fingerprint (key, computed when omitted) is unchanged.
+    """
+    key = key or schema_fingerprint(engine)
+    header = f"# key={key}\n"
+    
+    if os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as f:
+            if f.readline() == header:
+                return f.read()
+    
+    schema_text = generate_schema_description(engine)
+    write_cache_file(cache_path, header + schema_text)
+    
+    return schema_text
+
+def write_cache_file(cache_path: str, content: str):
+    """
+    Write a cache file via a temp file and rename, so readers never see a partial file.
+    """
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, cache_path)
@@ -1,14 +1,18 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Uuid, UniqueConstraint, Index, text
 from sqlalchemy.orm import relationship, declarative_base
 
 Base = declarative_base()
 
+# Olist ids are 32-char hex MD5 strings; a native uuid column stores them in 16 bytes
+# and still accepts (and compares against) the original hex text
+HexId = Uuid(as_uuid=False)
+
 # Customers Table
 class Customer(Base):
     __tablename__ = 'customers'
     
-    customer_id = Column(String, primary_key=True, index=True)
-    customer_unique_id = Column(String, index=True) # Removed unique=True to allow multiple orders per customer
+    customer_id = Column(HexId, primary_key=True, index=True)
+    customer_unique_id = Column(HexId, index=True) # Removed unique=True to allow multiple orders per customer
     customer_zip_code_prefix = Column(String)
     customer_city = Column(String)
     customer_state = Column(String)
@@ -20,8 +24,8 @@ class Customer(Base):
 class Order(Base):
     __tablename__ = 'orders'
     
-    order_id = Column(String, primary_key=True, index=True)
-    customer_id = Column(String, ForeignKey('customers.customer_id'), index=True)
+    order_id = Column(HexId, primary_key=True, index=True)
+    customer_id = Column(HexId, ForeignKey('customers.customer_id'), index=True)
     order_status = Column(String)
     order_purchase_timestamp = Column(DateTime)
     order_approved_at = Column(DateTime)
@@ -39,7 +43,7 @@ class Order(Base):
 class Product(Base):
     __tablename__ = 'products'
     
-    product_id = Column(String, primary_key=True, index=True)
+    product_id = Column(HexId, primary_key=True, index=True)
     product_category_name = Column(String, index=True)
     product_name_length = Column(Integer)
     product_description_length = Column(Integer)
@@ -56,12 +60,15 @@ class Product(Base):
 # Order Items Table
 class OrderItem(Base):
     __tablename__ = 'order_items'
+    # Covers the order -> product join (e.g. the RAG review extract) without heap fetches;
+    # order_id leads, so it also serves plain order_id lookups
+    __table_args__ = (Index('ix_order_items_order_product', 'order_id', 'product_id'),)
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    order_id = Column(String, ForeignKey('orders.order_id'), index=True)
+    order_id = Column(HexId, ForeignKey('orders.order_id'))
     order_item_id = Column(Integer)
-    product_id = Column(String, ForeignKey('products.product_id'), index=True)
-    seller_id = Column(String, ForeignKey('sellers.seller_id'), index=True)
+    product_id = Column(HexId, ForeignKey('products.product_id'), index=True)
+    seller_id = Column(HexId, ForeignKey('sellers.seller_id'), index=True)
     shipping_limit_date = Column(DateTime)
     price = Column(Float)
     freight_value = Column(Float)
@@ -75,7 +82,7 @@ class OrderItem(Base):
 class Seller(Base):
     __tablename__ = 'sellers'
     
-    seller_id = Column(String, primary_key=True, index=True)
+    seller_id = Column(HexId, primary_key=True, index=True)
     seller_zip_code_prefix = Column(String)
     seller_city = Column(String)
     seller_state = Column(String)
@@ -89,8 +96,8 @@ class SellerProduct(Base):
     __tablename__ = 'seller_products'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    seller_id = Column(String, ForeignKey('sellers.seller_id'))
-    product_id = Column(String, ForeignKey('products.product_id'))
+    seller_id = Column(HexId, ForeignKey('sellers.seller_id'))
+    product_id = Column(HexId, ForeignKey('products.product_id'))
     
     # Relationships
     seller = relationship("Seller", back_populates="products")
@@ -101,7 +108,7 @@ class Payment(Base):
     __tablename__ = 'payments'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    order_id = Column(String, ForeignKey('orders.order_id'), index=True)
+    order_id = Column(HexId, ForeignKey('orders.order_id'), index=True)
     payment_sequential = Column(Integer)
     payment_type = Column(String)
     payment_installments = Column(Integer)
@@ -113,10 +120,14 @@ class Payment(Base):
 # Reviews Table
 class Review(Base):
     __tablename__ = 'reviews'
+    # Only reviews with a comment are extracted for RAG
+    __table_args__ = (
+        Index('ix_reviews_notnull_msg', 'order_id', postgresql_where=text("review_comment_message IS NOT NULL")),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True) # Added surrogate key
-    review_id = Column(String, index=True) # Removed primary_key=True
-    order_id = Column(String, ForeignKey('orders.order_id'), index=True)
+    review_id = Column(HexId, index=True) # Removed primary_key=True
+    order_id = Column(HexId, ForeignKey('orders.order_id'), index=True)
     review_score = Column(Integer)
     review_comment_title = Column(Text)
     review_comment_message = Column(Text)
@@ -129,9 +140,11 @@ class Review(Base):
 # Geolocation Table
 class Geolocation(Base):
     __tablename__ = 'geolocation'
+    # One row per zip code prefix; the import relies on it to drop duplicates (its index also serves lookups)
+    __table_args__ = (UniqueConstraint('geolocation_zip_code_prefix'),)
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    geolocation_zip_code_prefix = Column(String, index=True)
+    geolocation_zip_code_prefix = Column(String)
     geolocation_lat = Column(Float)
     geolocation_lng = Column(Float)
     geolocation_city = Column(String)
@@ -1,25 +1,258 @@
-from prometheus_client import Counter, Histogram, start_http_server
+import atexit
+import errno
+import functools
+import os
+import socket
+import socketserver
+import stat
+import threading
 import time
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-# Counter for LLM token usage
-llm_tokens_total = Counter(
-    'llm_tokens_total',
-    'Total number of LLM tokens used',
-    ['model', 'operation']
-)
+if TYPE_CHECKING:
+    from prometheus_client import Counter
 
-# Histogram for Agent response time
-agent_response_time_seconds = Histogram(
-    'agent_response_time_seconds',
-    'Agent response time in seconds',
-    ['operation']
-)
+# prometheus_client is imported, and the metrics registered, on first use
+# (see _lazy), so scripts importing this module don't pay for it up front
+
+# Histogram buckets for Agent response time. A few buckets sized for LLM
+# round-trips (plus 0.1 s for cached-SQL runs) keep observe() cheap versus the
+# 15 defaults; unlike a Summary, the buckets still aggregate across instances
+AGENT_LATENCY_BUCKETS = (0.1, 0.5, 1, 2, 5, 10, 30)
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+def _lazy():
+    """Import prometheus_client and create the metrics once, on first use"""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            from prometheus_client import Counter, Histogram, disable_created_metrics
+            
+            # Skip the *_created series (one extra sample per label set on every scrape)
+            # unless PROMETHEUS_DISABLE_CREATED_SERIES=False is set explicitly
+            if os.environ.get("PROMETHEUS_DISABLE_CREATED_SERIES", "True").lower() == "true":
+                disable_created_metrics()
+            
+            # Counter for LLM token usage
+            llm_tokens_total = Counter(
+                'llm_tokens_total',
+                'Total number of LLM tokens used',
+                ['model', 'operation']
+            )
+            
+            # Histogram for Agent response time
+            agent_response_time_seconds = Histogram(
+                'agent_response_time_seconds',
+                'Agent response time in seconds',
+                ['operation'],
+                buckets=AGENT_LATENCY_BUCKETS
+            )
+            
+            _metrics = (llm_tokens_total, agent_response_time_seconds)
+    return _metrics
+
+def get_token_counter():
+    """The llm_tokens_total Counter"""
+    return (_metrics or _lazy())[0]
+
+def get_latency_histogram():
+    """The agent_response_time_seconds Histogram"""
+    return (_metrics or _lazy())[1]
+
+@functools.lru_cache(maxsize=None)
+def _operation_timer(operation: str):
+    # Labelled children are resolved once per operation; hot paths reuse them instead of .labels(...)
+    return get_latency_histogram().labels(operation=operation)
+
+class MonoTimer:
+    """
+    Times a block with time.monotonic_ns() (immune to wall-clock jumps, integer
+    arithmetic) and observes the elapsed seconds once, on exit
+    """
+    __slots__ = ("metric", "start_ns")
+
+    def __init__(self, metric):
+        self.metric = metric
+
+    def __enter__(self):
+        self.start_ns = time.monotonic_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metric.observe((time.monotonic_ns() - self.start_ns) / 1e9)
+
+def mono_time(operation: str) -> MonoTimer:
+    """Context manager timing one operation into agent_response_time_seconds"""
+    return MonoTimer(_operation_timer(operation))
+
+def time_agent_run() -> MonoTimer:
+    """Context manager timing one agent run"""
+    return MonoTimer(_operation_timer("agent_run"))
+
+class BatchCounter:
+    """
+    Accumulates counter increments in a plain dict and applies them with a
+    single inc() per label set on flush(), instead of one locked
+    prometheus_client increment per event. Safe to share between threads.
+    """
+
+    # Label values are joined into one dict key
+    SEPARATOR = "--"
+
+    def __init__(self, counter: Optional["Counter"] = None):
+        # Defaults to llm_tokens_total, resolved on flush
+        self.counter = counter
+        self._pending: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, labels: Tuple[str, ...], n: float = 1):
+        key = self.SEPARATOR.join(labels)
+        with self._lock:
+            self._pending[key] = self._pending.get(key, 0) + n
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        counter = self.counter or get_token_counter()
+        for key, value in pending.items():
+            if value:
+                counter.labels(*key.split(self.SEPARATOR)).inc(value)
+
+# Thread-local token shards: each thread adds to its own dict under its own
+# (practically uncontended) lock, and a background thread folds all shards
+# into llm_tokens_total every TOKEN_FLUSH_INTERVAL_SECONDS and at exit
+TOKEN_FLUSH_INTERVAL_SECONDS = 5.0
+
+class _TokenShard:
+    def __init__(self):
+        self.thread = threading.current_thread()
+        self.lock = threading.Lock()
+        self.pending: Dict[Tuple[str, str], float] = {}
+
+_tls = threading.local()
+_shards: List[_TokenShard] = []
+_shards_lock = threading.Lock()
+_flusher: Optional[threading.Thread] = None
+
+def _token_shard() -> _TokenShard:
+    global _flusher
+    shard = getattr(_tls, "shard", None)
+    if shard is None:
+        shard = _tls.shard = _TokenShard()
+        with _shards_lock:
+            _shards.append(shard)
+            if _flusher is None:
+                _flusher = threading.Thread(target=_flush_periodically, name="token-metrics-flush", daemon=True)
+                _flusher.start()
+    return shard
+
+def inc_tokens(model: str, operation: str, n: float):
+    """Count LLM tokens on the calling thread's shard (reported on the next flush)"""
+    if not n:
+        return
+    shard = _token_shard()
+    with shard.lock:
+        shard.pending[(model, operation)] = shard.pending.get((model, operation), 0) + n
+
+def flush_tokens():
+    """Fold every thread's pending tokens into llm_tokens_total"""
+    with _shards_lock:
+        shards = list(_shards)
+    
+    totals: Dict[Tuple[str, str], float] = {}
+    for shard in shards:
+        with shard.lock:
+            pending, shard.pending = shard.pending, {}
+        for key, value in pending.items():
+            totals[key] = totals.get(key, 0) + value
+    
+    for (model, operation), value in totals.items():
+        get_token_counter().labels(model=model, operation=operation).inc(value)
+    
+    # Forget shards of finished threads once they have been drained
+    with _shards_lock:
+        _shards[:] = [shard for shard in _shards if shard.thread.is_alive() or shard.pending]
+
+def _flush_periodically():
+    while True:
+        time.sleep(TOKEN_FLUSH_INTERVAL_SECONDS)
+        flush_tokens()
+
+atexit.register(flush_tokens)
 
 def start_metrics_server(port: int = 8000):
+    from prometheus_client import start_http_server
+    
     start_http_server(port)
     print(f"Prometheus metrics server started on port {port}")
 
+class _UnixWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+    """WSGI server listening on a UNIX domain socket instead of TCP"""
+    address_family = socket.AF_UNIX
+    daemon_threads = True
+
+    def server_bind(self):
+        # HTTPServer.server_bind expects a (host, port) address
+        socketserver.TCPServer.server_bind(self)
+        self.server_name = "localhost"
+        self.server_port = 0
+        self.setup_environ()
+
+class _UnixRequestHandler(WSGIRequestHandler):
+    def __init__(self, request, client_address, server):
+        # UNIX socket peers have no address; WSGI needs a REMOTE_ADDR
+        super().__init__(request, ("local", 0), server)
+
+    def log_message(self, format, *args):
+        pass
+
+def _remove_stale_socket(path: str):
+    """Unlink path only if it is a socket nobody is listening on"""
+    if not os.path.lexists(path):
+        return
+    if not stat.S_ISSOCK(os.lstat(path).st_mode):
+        raise FileExistsError(f"Metrics socket path {path} exists and is not a socket")
+    
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        # Left behind by a process that exited without unlinking it
+        os.remove(path)
+        return
+    finally:
+        probe.close()
+    raise OSError(errno.EADDRINUSE, f"Metrics socket {path} is in use by another process")
+
+def start_metrics_uds(path: str):
+    """
+    Serve metrics on a UNIX domain socket, for a Prometheus scraping from
+    the same host (no TCP handshake or loopback stack per scrape).
+    start_metrics_server remains the TCP option.
+    
+    Args:
+        path: Socket file path (a stale socket from a previous run is replaced)
+    
+    Raises:
+        FileExistsError: path exists and is not a socket
+        OSError: Another process is still serving on the socket
+    """
+    from prometheus_client import make_wsgi_app
+    
+    _remove_stale_socket(path)
+    
+    server = _UnixWSGIServer(path, _UnixRequestHandler)
+    server.set_app(make_wsgi_app())
+    threading.Thread(target=server.serve_forever, name="metrics-uds", daemon=True).start()
+    print(f"Prometheus metrics server started on unix socket {path}")
+    return server
+
 # Example usage:
-# llm_tokens_total.labels(model="gpt-4o", operation="completion").inc(token_count)
-# with agent_response_time_seconds.labels(operation="agent_run").time():
+# inc_tokens("gpt-4o", "completion", token_count)
+# with time_agent_run():
 #     ... run agent ...
+# with mono_time("generate_sql"):  # prefer over Histogram .labels(...).time()
+#     ... call the LLM ...
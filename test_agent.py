@@ -1,40 +1,68 @@
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from src.database.manager import DatabaseManager
 from src.llm.agent import SQLAgent
-from src.config.settings import settings
+from src.config.settings import get_settings
+from src.monitoring.metrics import BatchCounter
 import os
 
+# Test Questions (fixed, so built once at import)
+QUESTIONS = (
+    "How many customers are there?",
+    "Show me the top 5 product categories by number of products.",
+    "What is the total revenue (sum of payments)?",
+    "لیست ۵ ایالت که بیشترین مشتری را دارند بده" # Persian test
+)
+
 def main():
 
+    # UTF-8 regardless of the console code page (the Persian question can't be
+    # encoded in e.g. cp1252), without flushing on every newline
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(encoding="utf-8", line_buffering=False)
+
     if not os.getenv("OPENAI_API_KEY"):
-        os.environ["OPENAI_API_KEY"] = settings.OPENAI_API_KEY
+        os.environ["OPENAI_API_KEY"] = get_settings().OPENAI_API_KEY
 
-    db_manager = DatabaseManager()
+    # One pooled connection per concurrent run; each query checks one out briefly
+    db_manager = DatabaseManager(pool_size=len(QUESTIONS), max_overflow=4)
     if not db_manager.connect():
         print("Failed to connect to database.")
         return
 
     agent = SQLAgent(db_manager)
 
-    # Test Questions
-    questions = [
-        "How many customers are there?",
-        "Show me the top 5 product categories by number of products.",
-        "What is the total revenue (sum of payments)?",
-        "لیست ۵ ایالت که بیشترین مشتری را دارند بده" # Persian test
-    ]
-
-    for q in questions:
-        print(f"\n\nQuery: {q}")
-        print("-" * 30)
-        result = agent.run(q)
+    # Token usage is accumulated across the questions and reported in one flush
+    bc = BatchCounter()
+
+    def run_question(q):
+        # Each worker writes its report into its own buffer instead of printing line by line
+        result = agent.run(q, token_counter=bc)
+        buf = io.StringIO()
+        print(f"\n\nQuery: {q}", file=buf)
+        print("-" * 30, file=buf)
         
         if result.get("error"):
-            print(f"Final Error: {result['error']}")
+            print(f"Final Error: {result['error']}", file=buf)
         else:
-            print("SQL Generated:")
-            print(result['sql_query'])
-            print("\nResult:")
-            print(result['query_result'])
+            print("SQL Generated:", file=buf)
+            print(result['sql_query'], file=buf)
+            print("\nResult:", file=buf)
+            print(result['query_result'], file=buf)
+        return buf.getvalue()
+
+    # Runs are I/O-bound on the LLM API and the database, so overlap them;
+    # warm one pooled connection per concurrent run first
+    agent.prime(connections=len(QUESTIONS))
+    with ThreadPoolExecutor(max_workers=len(QUESTIONS)) as executor:
+        reports = list(executor.map(run_question, QUESTIONS))
+
+    # One write for all reports, in question order
+    sys.stdout.write("".join(reports))
+    sys.stdout.flush()
+
+    bc.flush()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,46 @@
+import os
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlsplit
+
+import pyarrow as pa
+import pytest
+
+import src.database.manager as manager
+from src.database.manager import DatabaseManager, with_session_options
+
+def make_manager(monkeypatch, database_url="postgresql://user:pw@localhost:5432/olist", timeout_ms=1234):
+    settings = SimpleNamespace(DATABASE_URL=database_url, DB_STATEMENT_TIMEOUT_MS=timeout_ms)
+    monkeypatch.setattr(manager, "get_settings", lambda: settings)
+    return DatabaseManager(use_pool=False)
+
+def test_with_session_options_keeps_existing_query():
+    url = with_session_options("postgresql://u:p@h:5432/db?sslmode=require", "-c statement_timeout=5")
+
+    query = parse_qs(urlsplit(url).query)
+    assert query["sslmode"] == ["require"]
+    assert query["options"] == ["-c statement_timeout=5"]
+    # Spaces are percent-encoded; connectorx doesn't decode '+'
+    assert "+" not in url
+
+def test_read_frame_passes_statement_timeout_to_connectorx(monkeypatch):
+    db_manager = make_manager(monkeypatch)
+    calls = []
+
+    def fake_read_sql(url, query, return_type):
+        calls.append(url)
+        return pa.table({"one": [1]})
+
+    monkeypatch.setattr(manager.cx, "read_sql", fake_read_sql)
+    db_manager.read_frame("SELECT 1 AS one")
+
+    options = parse_qs(urlsplit(calls[0]).query)["options"][0]
+    assert "-c statement_timeout=1234" in options
+    assert "-c application_name=rag_analytics" in options
+
+@pytest.mark.skipif(not os.environ.get("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL not set")
+def test_read_frame_statement_timeout_applies_on_server(monkeypatch):
+    db_manager = make_manager(monkeypatch, database_url=os.environ["TEST_DATABASE_URL"])
+
+    df = db_manager.read_frame("SELECT current_setting('statement_timeout') AS timeout")
+
+    assert df["timeout"].iloc[0] == "1234ms"
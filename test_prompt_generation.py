@@ -1,6 +1,9 @@
+import os
 from src.database.manager import DatabaseManager
-from src.llm.schema_generator import generate_schema_description
-from src.llm.prompts import get_system_prompt
+from src.llm.schema_generator import generate_schema_description_cached
+from src.llm.prompts import get_system_prompt_iter
+
+OUTPUT_FILE = "generated_system_prompt.txt"
 
 def main():
 
@@ -9,19 +12,23 @@ def main():
         print("Could not connect to database.")
         return
 
-    #  Generate Schema Context
+    #  Generate Schema Context (reused from .cache while the schema is unchanged)
     print("Generating Schema Description...")
-    schema_context = generate_schema_description(db_manager.engine)
+    schema_context = generate_schema_description_cached(db_manager.engine)
     
-    # Generate Full System Prompt
+    # Stream the Full System Prompt section by section instead of building it in memory
     print("Constructing System Prompt...")
-    full_prompt = get_system_prompt(schema_context)
-    
-    output_file = "generated_system_prompt.txt"
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(full_prompt)
+    # Pre-encoded UTF-8 goes straight to the fd, skipping TextIOWrapper's encode/newline layer
+    fd = os.open(OUTPUT_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        for section in get_system_prompt_iter(schema_context):
+            data = memoryview(section.encode("utf-8"))
+            while data:
+                data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
         
-    print(f"\nSuccess! The full system prompt has been saved to '{output_file}'.")
+    print(f"\nSuccess! The full system prompt has been saved to '{OUTPUT_FILE}'.")
 
 if __name__ == "__main__":
     main()